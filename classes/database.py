@@ -1,69 +1,190 @@
 # database.py
-from tinydb import TinyDB, Query
-from tinydb.storages import JSONStorage
-from tinydb.middlewares import CachingMiddleware
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from .utils import log
+
+SQLITE_HEADER = b'SQLite format 3\x00'
+COLUMNS = ('files', 'metadata', 'external_data')
+_MISS = object()
 
 class Database:
     def __init__(self, db_path='./podcasts.db'):
         """
-        Initialize the TinyDB database.
-        
-        :param db_path: Path to the JSON file where the database will be stored.
+        Initialize the SQLite database.
+
+        :param db_path: Path to the file where the database will be stored.
+        """
+        self.db_path = Path(db_path)
+        self._cache = {}
+        self.batch_depth = 0
+        legacy_data = self.read_legacy_database()
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS podcasts ("
+            "hash TEXT PRIMARY KEY, files TEXT, metadata TEXT, external_data TEXT)"
+        )
+        if legacy_data:
+            self.import_legacy_data(legacy_data)
+        self.conn.commit()
+
+    def read_legacy_database(self):
+        """
+        Read a database file written by the previous TinyDB storage, and move it out of the way.
+
+        :return: The legacy podcast rows, or None if there is no legacy database.
+        """
+        if not self.db_path.exists() or self.db_path.stat().st_size == 0:
+            return None
+        with self.db_path.open('rb') as db_file:
+            if db_file.read(len(SQLITE_HEADER)) == SQLITE_HEADER:
+                return None
+        with self.db_path.open('r') as db_file:
+            data = json.load(db_file)
+        backup_path = self.db_path.with_name(f"{self.db_path.name}.tinydb")
+        self.db_path.rename(backup_path)
+        log(f"Moved TinyDB database to {backup_path}, importing it into {self.db_path}", "info")
+        return list(data.get('podcasts', {}).values())
+
+    def import_legacy_data(self, rows):
+        """
+        Import podcast rows from the previous TinyDB storage.
+
+        :param rows: The legacy podcast rows.
+        """
+        for row in rows:
+            values = [json.dumps(row[column]) if column in row else None for column in COLUMNS]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO podcasts (hash, files, metadata, external_data) VALUES (?, ?, ?, ?)",
+                (row['hash'], *values)
+            )
+        log(f"Imported {len(rows)} podcasts from the TinyDB database", "debug")
+
+    @contextmanager
+    def batch(self):
+        """
+        Group writes into a single transaction, committed when the outermost batch exits.
+        """
+        self.batch_depth += 1
+        outermost = self.batch_depth == 1
+        try:
+            yield self
+        except BaseException:
+            # interrupts too, a transaction left open would swallow every later write
+            if outermost:
+                self.conn.rollback()
+                self._cache.clear()
+            raise
+        else:
+            if outermost:
+                self.conn.commit()
+        finally:
+            self.batch_depth -= 1
+
+    def commit(self):
+        """
+        Commit the pending writes, unless they are part of a batch.
+        """
+        if not self.batch_depth:
+            self.conn.commit()
+
+    def row_to_podcast(self, row):
+        """
+        Convert a database row to a podcast dictionary.
+
+        :param row: The database row.
+        :return: Dictionary containing the podcast data.
         """
-        self.db = TinyDB(db_path, storage=CachingMiddleware(JSONStorage))
-        self.table = self.db.table('podcasts')
-        self.Podcast = Query()
-    
+        podcast_data = {'hash': row[0]}
+        for column, value in zip(COLUMNS, row[1:]):
+            if value is not None:
+                podcast_data[column] = json.loads(value)
+        return podcast_data
+
     def insert_podcast(self, hash, files):
         """
         Insert a new podcast entry into the database.
-        
+
         :param hash: Hash used as a unique identifier.
-        :param files: Files dictionary.
-        """
-        podcast_data = {
-            'hash': hash,
-            'files': files,
-        }
-        self.table.upsert(podcast_data, self.Podcast.hash == hash)
-    
+        :param files: Files dictionary, paths in it are stored as strings.
+        """
+        self.conn.execute(
+            "INSERT INTO podcasts (hash, files) VALUES (?, ?) "
+            "ON CONFLICT(hash) DO UPDATE SET files = excluded.files",
+            # paths are serialized as they are encoded, without a converted copy of the files
+            (hash, json.dumps(files, default=str))
+        )
+        self.commit()
+        self._cache.pop(hash, None)
+
     def get_podcast(self, hash):
         """
         Retrieve a podcast entry by its hash.
-        
+
         :param hash: Hash to get.
         :return: Dictionary containing the podcast data, or None if not found.
         """
-        result = self.table.search(self.Podcast.hash == hash)
-        return result[0] if result else None
-    
+        # cache the raw row, callers get freshly decoded data they are free to modify
+        row = self._cache.get(hash, _MISS)
+        if row is _MISS:
+            row = self.conn.execute(
+                "SELECT hash, files, metadata, external_data FROM podcasts WHERE hash = ?",
+                (hash,)
+            ).fetchone()
+            self._cache[hash] = row
+        return self.row_to_podcast(row) if row else None
+
     def update_podcast(self, hash, **kwargs):
         """
         Update fields of an existing podcast entry.
-        
+
         :param hash: Hash to get.
         :param kwargs: Fields to update with their new values.
         """
-        self.table.update(kwargs, self.Podcast.hash == hash)
-    
+        for key, value in kwargs.items():
+            if key not in COLUMNS:
+                log(f"Unknown podcast field '{key}', not updating it", "warning")
+                continue
+            self.conn.execute(f"UPDATE podcasts SET {key} = ? WHERE hash = ?", (json.dumps(value), hash))
+        self.commit()
+        self._cache.pop(hash, None)
+
+    def rename_podcast(self, old_hash, new_hash):
+        """
+        Move a podcast entry to a new hash.
+
+        :param old_hash: Hash the podcast is stored under.
+        :param new_hash: Hash to store the podcast under.
+        """
+        self.conn.execute("UPDATE podcasts SET hash = ? WHERE hash = ?", (new_hash, old_hash))
+        self.commit()
+        self._cache.pop(old_hash, None)
+        self._cache.pop(new_hash, None)
+
     def delete_podcast(self, hash):
         """
         Delete a podcast entry from the database.
-        
+
         :param hash: Hash to delete.
         """
-        self.table.remove(self.Podcast.hash == hash)
-    
+        self.conn.execute("DELETE FROM podcasts WHERE hash = ?", (hash,))
+        self.commit()
+        self._cache.pop(hash, None)
+
     def get_all_podcasts(self):
         """
         Retrieve all podcast entries from the database.
-        
+
         :return: List of dictionaries containing podcast data.
         """
-        return self.table.all()
-    
+        rows = self.conn.execute("SELECT hash, files, metadata, external_data FROM podcasts")
+        return [self.row_to_podcast(row) for row in rows]
+
     def close(self):
         """
         Close the database connection.
         """
-        self.db.close()
+        self.conn.close()
@@ -1,10 +1,96 @@
 # file_analyzer.py
+import os
+import re
 import mutagen
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import NamedTuple
 from mutagen.mp3 import MP3
 from mutagen.mp4 import MP4
 from mutagen.mp3 import BitrateMode
-from .utils import spinner, log
+from .utils import spinner, log, AUDIO_EXTENSIONS
+
+def read_mp3_metadata(audiofile):
+    """
+    Read the metadata of an MP3 file.
+
+    :param audiofile: The mutagen MP3 object.
+    :return: The metadata of the audio file.
+    """
+    return {
+        'recording_date': audiofile.get("TDRC"),
+        'bitrate': round(audiofile.info.bitrate / 1000),
+        'bitrate_mode': "VBR" if audiofile.info.bitrate_mode == BitrateMode.VBR else "CBR",
+    }
+
+def read_mp4_metadata(audiofile):
+    """
+    Read the metadata of an MP4 file.
+
+    :param audiofile: The mutagen MP4 object.
+    :return: The metadata of the audio file.
+    """
+    bitrate = round(audiofile.info.bitrate / 1000)
+    return {
+        'recording_date': audiofile.tags.get("\xa9day", [None])[0],
+        'bitrate': bitrate,
+        'bitrate_mode': "CBR" if bitrate else "VBR",
+    }
+
+# metadata readers by mutagen file type
+METADATA_READERS = {
+    MP3: read_mp3_metadata,
+    MP4: read_mp4_metadata,
+}
+
+def get_trailer_regex(trailer_patterns):
+    """
+    Compile the trailer patterns into a single case-insensitive regex.
+
+    :param trailer_patterns: The trailer patterns from the config.
+    :return: The compiled regex, or None if there are no trailer patterns.
+    """
+    if not trailer_patterns:
+        return None
+    return re.compile('|'.join(re.escape(pattern) for pattern in trailer_patterns), re.IGNORECASE)
+
+def analyze_audio_file(file_path, trailer_regex):
+    """
+    Analyze an individual audio file and extract metadata.
+
+    This doesn't touch any analyzer state, so it can safely run on worker threads.
+    Files are filtered by AUDIO_EXTENSIONS in FileAnalyzer.analyze_files before they get here.
+
+    :param file_path: The path to the audio file.
+    :param trailer_regex: The compiled trailer regex, trailers get no duration.
+    :return: The metadata of the audio file, or None if it isn't a supported audio file.
+    """
+    audiofile = mutagen.File(file_path)
+    if not audiofile or not hasattr(audiofile, 'info'):
+        log(f"Unsupported or corrupt file, skipping: {file_path}", "warning")
+        return None
+
+    read_metadata = METADATA_READERS.get(type(audiofile))
+    if not read_metadata:
+        log(f"Unsupported audio format, skipping: {file_path}", "warning")
+        return None
+    metadata = read_metadata(audiofile)
+
+    if not trailer_regex or not trailer_regex.search(file_path.name):
+        metadata['duration'] = audiofile.info.length
+
+    return metadata
+
+class FileRecord(NamedTuple):
+    """
+    What the analyzer knows about a single audio file.
+    """
+    bitrate: str
+    file_format: str
+    date: str
+    duration: float
 
 class FileAnalyzer:
     def __init__(self, podcast, config):
@@ -25,24 +111,37 @@ class FileAnalyzer:
         self.first_episode_date = None
         self.real_first_episode_date = None
         self.original_files = None
+        self.files = {}
+        self.files_version = 0
+        self.grouped_files = {}
+        self.duration_stats = (None, None)
+        self.trailer_regex = get_trailer_regex(config.get('trailer_patterns', []))
 
     def analyze_files(self):
         """
         Analyze the audio files in the podcast folder.
         """
-        self.bitrates = defaultdict(list)
-        self.file_formats = defaultdict(list)
         if self.file_dates and not self.original_files:
             self.original_files = self.file_dates
         self.file_dates = defaultdict(list)
         self.all_vbr = True
-        self.durations = defaultdict(list)
+        self.files = {}
+        self.files_version += 1
         all_bad = True
-        trailer_patterns = self.config.get('trailer_patterns', [])
         with spinner("Checking files") as spin:
-            for file_path in self.podcast.folder_path.iterdir():
-                if file_path.suffix.lower() in ['.mp3', '.m4a']:
-                    metadata = self.analyze_audio_file(file_path, trailer_patterns)
+            file_paths = []
+            with os.scandir(self.podcast.folder_path) as entries:
+                for entry in entries:
+                    # this is the one audio file filter, the suffix check doesn't need a stat
+                    if Path(entry.name).suffix.lower() not in AUDIO_EXTENSIONS:
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    file_paths.append(self.podcast.folder_path / entry.name)
+            # read tags in parallel, but process the results in order on this thread
+            with ThreadPoolExecutor(max_workers=self.config.get('file_threads', 8)) as executor:
+                results = executor.map(analyze_audio_file, file_paths, repeat(self.trailer_regex))
+                for file_path, metadata in zip(file_paths, results):
                     if metadata:
                         all_bad = False
                         self.process_metadata(metadata, file_path)
@@ -50,75 +149,28 @@ class FileAnalyzer:
                 spin.fail("✖")
                 log("No valid audio files found", "critical")
                 return
-            # sort self.file_dates
-            self.file_dates = dict(sorted(self.file_dates.items()))
             self.get_date_range()
             spin.ok("✔")
 
-    def analyze_audio_file(self, file_path, trailer_patterns):
-        """
-        Analyze an individual audio file and extract metadata.
-        
-        :param file_path: The path to the audio file.
-        :return: The metadata of the audio file.
-        """
-        audiofile = mutagen.File(file_path)
-        if not audiofile or not hasattr(audiofile, 'info'):
-            log(f"Unsupported or corrupt file, skipping: {file_path}", "warning")
-            return None
-
-        if not any(pattern.lower() in file_path.name.lower() for pattern in trailer_patterns):
-            if isinstance(audiofile, MP3) or isinstance(audiofile, MP4):
-                if audiofile.info.length:
-                    self.durations[audiofile.info.length].append(file_path)
-
-        metadata = {}
-        if isinstance(audiofile, MP3):
-            metadata['recording_date'] = audiofile.get("TDRC")
-            metadata['bitrate'] = round(audiofile.info.bitrate / 1000)
-            metadata['bitrate_mode'] = "VBR" if audiofile.info.bitrate_mode == BitrateMode.VBR else "CBR"
-        elif isinstance(audiofile, MP4):
-            metadata['recording_date'] = audiofile.tags.get("\xa9day", [None])[0]
-            metadata['bitrate'] = round(audiofile.info.bitrate / 1000)
-            metadata['bitrate_mode'] = "CBR" if metadata['bitrate'] else "VBR"
-        else:
-            log(f"Unsupported audio format, skipping: {file_path}", "warning")
-            return None
-        
-        if metadata['bitrate_mode'] != "VBR":
-            self.all_vbr = False
-
-        return metadata
-    
     def get_date_range(self):
         """
         Get the date range of the audio files.
         
         :return: The date range as a tuple of the earliest and latest dates.
         """
-        self.file_dates = {k: v for k, v in self.file_dates.items() if v}
-        self.earliest_year = None
-        self.first_episode_date = None
-        self.real_first_episode_date = None
-        self.last_episode_date = None
-        self.real_last_episode_date = None
+        # a new dict instead of deleting keys, callers can be looping over the old one
+        self.file_dates = defaultdict(list, {date_str: files for date_str, files in self.file_dates.items() if files})
 
-        for date_str in self.file_dates.keys():
-            year = int(str(date_str)[:4])
-            if self.earliest_year is None or (year and year < self.earliest_year):
-                self.earliest_year = year
-            if self.first_episode_date is None or date_str < self.first_episode_date:
-                self.real_first_episode_date = self.first_episode_date = date_str
-            if self.last_episode_date is None or date_str > self.last_episode_date:
-                self.real_last_episode_date = self.last_episode_date = date_str
+        # files without a recording date don't count towards the range
+        dates = [date_str for date_str in self.file_dates if date_str != "Unknown"]
+        self.first_episode_date = min(dates, default=None)
+        self.last_episode_date = max(dates, default=None)
+        self.earliest_year = int(str(self.first_episode_date)[:4]) if self.first_episode_date else None
 
         if self.original_files:
-            for date_str in self.original_files.keys():
-                year = int(str(date_str)[:4])
-                if self.real_first_episode_date is None or (date_str and date_str < self.real_first_episode_date):
-                    self.real_first_episode_date = date_str
-                if self.real_last_episode_date is None or (date_str and date_str > self.real_last_episode_date):
-                    self.real_last_episode_date = date_str
+            dates.extend(date_str for date_str in self.original_files if date_str and date_str != "Unknown")
+        self.real_first_episode_date = min(dates, default=None)
+        self.real_last_episode_date = max(dates, default=None)
 
     def process_metadata(self, metadata, file_path):
         """
@@ -129,22 +181,74 @@ class FileAnalyzer:
         """
         recording_date = metadata.get('recording_date')
         if recording_date:
-            year = int(str(recording_date)[:4])
             date_str = str(recording_date)
         else:
             log(f"Failed to get recording date for: {file_path}", "error")
-            year = None
             date_str = "Unknown"
 
         self.file_dates[date_str].append(file_path)
 
         bitrate = metadata['bitrate']
         bitrate_mode = metadata['bitrate_mode']
-        bitrate_str = "VBR" if "vbr" in bitrate_mode.lower() else f"{bitrate} kbps"
-        self.bitrates[bitrate_str].append(file_path)
-
+        bitrate_str = "VBR" if bitrate_mode == "VBR" else f"{bitrate} kbps"
         file_format = file_path.suffix.lower()[1:]
-        self.file_formats[file_format].append(file_path)
+
+        duration = metadata.get('duration')
+
+        if bitrate_mode != "VBR":
+            self.all_vbr = False
+
+        self.files[file_path] = FileRecord(bitrate_str, file_format, date_str, duration)
+        self.files_version += 1
+
+    def get_grouped_files(self, field):
+        """
+        Group the analyzed files by one of the file record fields.
+
+        The grouping is built on first use and kept until the files change.
+
+        :param field: The name of the FileRecord field to group by.
+        :return: Dictionary of field values to lists of file paths.
+        """
+        version, grouped = self.grouped_files.get(field, (None, None))
+        if version != self.files_version:
+            grouped = defaultdict(list)
+            for file_path, record in self.files.items():
+                grouped[getattr(record, field)].append(file_path)
+            self.grouped_files[field] = (self.files_version, grouped)
+        return grouped
+
+    @property
+    def bitrates(self):
+        """
+        The analyzed files grouped by bitrate.
+        """
+        return self.get_grouped_files('bitrate')
+
+    @property
+    def file_formats(self):
+        """
+        The analyzed files grouped by file format.
+        """
+        return self.get_grouped_files('file_format')
+
+    def get_duration_stats(self):
+        """
+        Get the average, longest and shortest duration of the audio files in a single pass.
+
+        The result is kept until the files change.
+
+        :return: Tuple of the average, longest and shortest duration in seconds, or Nones if there are no durations.
+        """
+        version, stats = self.duration_stats
+        if version != self.files_version:
+            durations = [record.duration for record in self.files.values() if record.duration]
+            if durations:
+                stats = (sum(durations) / len(durations), max(durations), min(durations))
+            else:
+                stats = (None, None, None)
+            self.duration_stats = (self.files_version, stats)
+        return stats
 
     def get_average_duration(self):
         """
@@ -152,10 +256,7 @@ class FileAnalyzer:
         
         :return: The average duration in seconds.
         """
-        durations = list(self.durations.keys())
-        if not durations:
-            return None
-        return sum(durations) / len(durations)
+        return self.get_duration_stats()[0]
     
     def get_longest_duration(self):
         """
@@ -163,10 +264,7 @@ class FileAnalyzer:
         
         :return: The longest duration in seconds.
         """
-        durations = list(self.durations.keys())
-        if not durations:
-            return None
-        return max(durations)
+        return self.get_duration_stats()[1]
     
     def get_shortest_duration(self):
         """
@@ -174,51 +272,50 @@ class FileAnalyzer:
         
         :return: The shortest duration in seconds.
         """
-        durations = list(self.durations.keys())
-        if not durations:
-            return None
-        return min(durations)
+        return self.get_duration_stats()[2]
     
     def remove_file(self, file_path):
         """
-        Remove a file from bitrates and file formats.
+        Remove a file from the analyzed files.
         
         :param file_path: The path to the file to remove.
         """
-        for bitrate_list in self.bitrates.values():
-            if file_path in bitrate_list:
-                bitrate_list.remove(file_path)
-                log(f"Removed bitrate path: {file_path}", "debug")
-        for format_list in self.file_formats.values():
-            if file_path in format_list:
-                format_list.remove(file_path)
-                log(f"Removed format list path: {file_path}", "debug")
-        for date_list in self.file_dates.values():
-            if file_path in date_list:
-                date_list.remove(file_path)
-                log(f"Removed date list path: {file_path}", "debug")
-
-        self.get_date_range()
+        record = self.files.pop(file_path, None)
+        if not record:
+            return
+        self.files_version += 1
+        self.file_dates[record.date].remove(file_path)
+        log(f"Removed file path: {file_path}", "debug")
+
+        if not self.file_dates[record.date]:
+            self.get_date_range()
 
     def update_file_path(self, old_path, new_path):
         """
-        Update the file path in bitrates and file formats.
+        Update the path of an analyzed file.
         
         :param old_path: The old path to the file.
         :param new_path: The new path to the file.
         """
-        for bitrate_list in self.bitrates.values():
-            if old_path in bitrate_list:
-                bitrate_list.remove(old_path)
-                bitrate_list.append(new_path)
-                log(f"Updated bitrate path: {old_path} -> {new_path}", "debug")
-        for format_list in self.file_formats.values():
-            if old_path in format_list:
-                format_list.remove(old_path)
-                format_list.append(new_path)
-                log(f"Updated format list path: {old_path} -> {new_path}", "debug")
-        for date_list in self.file_dates.values():
-            if old_path in date_list:
-                date_list.remove(old_path)
-                date_list.append(new_path)
-                log(f"Updated date list path: {old_path} -> {new_path}", "debug")
+        self.update_file_paths([(old_path, new_path)])
+
+    def update_file_paths(self, moves):
+        """
+        Update the paths of a batch of analyzed files.
+
+        All records are taken out before any is put back, so swapped names don't overwrite each other.
+
+        :param moves: List of (old path, new path) tuples.
+        """
+        records = [(old_path, new_path, self.files.pop(old_path, None)) for old_path, new_path in moves]
+        renamed = defaultdict(dict)
+        for old_path, new_path, record in records:
+            if not record:
+                continue
+            self.files[new_path] = record
+            renamed[record.date][old_path] = new_path
+            log(f"Updated file path: {old_path} -> {new_path}", "debug")
+        if renamed:
+            self.files_version += 1
+        for date, paths in renamed.items():
+            self.file_dates[date] = [paths.get(file_path, file_path) for file_path in self.file_dates[date]]
@@ -1,13 +1,28 @@
 # file_organizer.py
-import fnmatch
 import mutagen
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from mutagen.easyid3 import EasyID3
 from mutagen.mp4 import MP4
-from .utils import spinner, titlecase_filename, announce, log, perform_replacements
-from .utils import format_last_date, ask_yes_no, take_input, normalize_string
+from .utils import spinner, titlecase_filename, announce, log, debug_enabled, compile_replacements, apply_replacements
+from .utils import format_last_date, parse_date, ask_yes_no, take_input, normalize_string
+from .utils import get_regex_flags, AUDIO_EXTENSIONS
+from .file_analyzer import get_trailer_regex
+
+# mp4 tag names by their easyid3 field name
+MP4_TAGS = {
+    'title': '\xa9nam',
+    'artist': '\xa9ART',
+    'album': '\xa9alb',
+    'genre': '\xa9gen',
+    'date': '\xa9day',
+    'comment': '\xa9cmt',
+    'composer': '\xa9wrt',
+    'albumartist': 'aART',
+}
 
 class FileOrganizer:
     def __init__(self, podcast, config):
@@ -21,18 +36,182 @@ class FileOrganizer:
         """
         self.podcast = podcast
         self.config = config
-        self.unwanted_files = self.config.get('unwanted_files', [])
+        unwanted_files = self.config.get('unwanted_files', [])
+        self.unwanted_regex = re.compile('|'.join(re.escape(unwanted_file.lower()) for unwanted_file in unwanted_files)) if unwanted_files else None
+        self.files = None
+        self.files_folder = None
+        self.file_replacements = compile_replacements(self.config.get('file_replacements', []))
+        self.ep_nr_at_end_file_pattern = re.compile(self.config.get('ep_nr_at_end_file_pattern', r'^(.* - )(\d{4}-\d{2}-\d{2}) (.*?)( - )((Ep\.?|Episode|E)?\s*(\d+))(\.\w+)$'))
+        self.episode_pattern = re.compile(self.config.get('episode_pattern', r'(Ep\.?|Episode|E|Part)(\s*)(\d+)'), re.IGNORECASE)
+        # the check for missing episode numbers has its own, narrower fallback
+        self.missing_episode_pattern = re.compile(self.config.get('episode_pattern', r'(Ep\.?|Episode)\s*(\d+)'), re.IGNORECASE)
+        self.numbered_episode_pattern = re.compile(self.config.get('numbered_episode_pattern', r'^(.* - )(\d{4}-\d{2}-\d{2}) (\d+)\. (.*)(\.\w+)'))
+        self.unnumbered_episode_pattern = re.compile(self.config.get('unnumbered_episode_pattern', r'^(.*) - (\d{4}-\d{2}-\d{2}) (.*)(\.\w+)'))
+        self.date_pattern = re.compile(self.config.get('date_pattern', r'\b(\d{4}-\d{2}-\d{2})\b'))
+        self.title_split_pattern = re.compile(self.config.get('title_split_pattern', r' - (?=[^-]*$)'))
+        self.trailer_regex = get_trailer_regex(self.config.get('trailer_patterns', []))
+
+    def get_files(self):
+        """
+        Get the files in the podcast folder and its subfolders.
+
+        The folder is scanned once and the result is kept up to date when files are renamed or deleted,
+        it's only scanned again when the podcast folder changes.
+
+        :return: Dictionary of file paths to their lowercased names.
+        """
+        folder_path = Path(self.podcast.folder_path)
+        if self.files is None or self.files_folder != folder_path:
+            self.files = {}
+            self.files_folder = folder_path
+            folders = [folder_path]
+            while folders:
+                with os.scandir(folders.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            folders.append(Path(entry.path))
+                        elif entry.is_file():
+                            self.files[Path(entry.path)] = entry.name.lower()
+        return self.files
+
+    def move_file(self, file_path, new_path):
+        """
+        Rename a file and update the file list.
+
+        :param file_path: The path to the file.
+        :param new_path: The new path to the file.
+        :return: The new path to the file.
+        """
+        file_path.rename(new_path)
+        self.track_move(file_path, new_path)
+        return new_path
+
+    def track_move(self, file_path, new_path):
+        """
+        Update the file list after a file was renamed.
+
+        :param file_path: The old path to the file.
+        :param new_path: The new path to the file.
+        """
+        if self.files is not None:
+            self.files.pop(file_path, None)
+            self.files[new_path] = new_path.name.lower()
+
+    def move_files(self, renames):
+        """
+        Rename a batch of files on a thread pool and update the file list.
+
+        Renames onto a name that is still taken by another file wait until the rest are done,
+        so chains like A -> B, B -> C don't overwrite anything. Whatever is still blocked after
+        that, swaps like A -> B, B -> A or renames onto a file that isn't being renamed, goes
+        through a temporary name, and like a plain rename it replaces a file that is in the way.
+
+        :param renames: Dictionary of file paths to their new paths.
+        :return: List of (old path, new path) tuples for the files that were renamed.
+        """
+        files = self.get_files()
+        blocked = {file_path: new_path for file_path, new_path in renames.items() if new_path in files}
+        ready = [(file_path, new_path) for file_path, new_path in renames.items() if file_path not in blocked]
+        moved = []
+
+        with ThreadPoolExecutor(max_workers=self.config.get('file_threads', 8)) as executor:
+            futures = [executor.submit(file_path.rename, new_path) for file_path, new_path in ready]
+        for (file_path, new_path), future in zip(ready, futures):
+            try:
+                future.result()
+            except OSError as e:
+                log(f"Failed to rename '{file_path.name}' to '{new_path.name}': {e}", "error")
+                continue
+            self.track_move(file_path, new_path)
+            moved.append((file_path, new_path))
+
+        while blocked:
+            unblocked = [(file_path, new_path) for file_path, new_path in blocked.items() if new_path not in files]
+            if not unblocked:
+                break
+            for file_path, new_path in unblocked:
+                del blocked[file_path]
+                if self.try_move_file(file_path, new_path):
+                    moved.append((file_path, new_path))
+
+        # a file that failed to move is still in the way, and isn't replaced
+        stuck = [file_path for file_path, new_path in blocked.items() if new_path in renames and new_path not in blocked]
+        while stuck:
+            for file_path in stuck:
+                log(f"Not renaming '{file_path.name}', '{blocked.pop(file_path).name}' could not be moved", "warning")
+            stuck = [file_path for file_path, new_path in blocked.items() if new_path in renames and new_path not in blocked]
+
+        # move all of them out of the way first, so none of them replaces another one
+        temporary = {}
+        for file_path, new_path in blocked.items():
+            temp_path = file_path.with_name(f".{file_path.name}.tmp")
+            if self.try_move_file(file_path, temp_path):
+                temporary[file_path] = temp_path
+        for file_path, temp_path in temporary.items():
+            new_path = blocked[file_path]
+            if new_path in files:
+                log(f"Replacing '{new_path.name}' with '{file_path.name}'", "warning")
+            if self.try_move_file(temp_path, new_path):
+                moved.append((file_path, new_path))
+            else:
+                self.try_move_file(temp_path, file_path)
+
+        return moved
+
+    def try_move_file(self, file_path, new_path):
+        """
+        Rename a file and update the file list, logging instead of raising if it fails.
+
+        :param file_path: The path to the file.
+        :param new_path: The new path to the file.
+        :return: True if the file was renamed, False otherwise.
+        """
+        try:
+            self.move_file(file_path, new_path)
+        except OSError as e:
+            log(f"Failed to rename '{file_path.name}' to '{new_path.name}': {e}", "error")
+            return False
+        return True
+
+    def delete_files(self, file_paths):
+        """
+        Delete files on a thread pool and remove them from the file list.
+
+        :param file_paths: The paths to the files.
+        :return: List of the paths that were deleted.
+        """
+        with ThreadPoolExecutor(max_workers=self.config.get('file_threads', 8)) as executor:
+            futures = [executor.submit(file_path.unlink) for file_path in file_paths]
+        deleted = []
+        for file_path, future in zip(file_paths, futures):
+            try:
+                future.result()
+            except OSError as e:
+                log(f"Failed to delete '{file_path.name}': {e}", "error")
+                continue
+            if self.files is not None:
+                self.files.pop(file_path, None)
+            deleted.append(file_path)
+        return deleted
 
     def rename_files(self):
         """
         Rename the episode files in the podcast folder.
         """
-        ep_nr_at_end_file_pattern = re.compile(self.config.get('ep_nr_at_end_file_pattern', r'^(.* - )(\d{4}-\d{2}-\d{2}) (.*?)( - )((Ep\.?|Episode|E)?\s*(\d+))(\.\w+)$'))
-        for file_path in Path(self.podcast.folder_path).rglob('*'):
-            if file_path.is_file():
-                new_file_path = self.rename_file(file_path, ep_nr_at_end_file_pattern)
-                if new_file_path != file_path:
-                    self.podcast.analyzer.update_file_path(file_path, new_file_path)
+        renames = {}
+        new_paths = set()
+        for file_path in self.get_files():
+            new_name = self.get_file_name(file_path, self.ep_nr_at_end_file_pattern)
+            if new_name == file_path.name:
+                continue
+            new_path = file_path.with_name(new_name)
+            if new_path in new_paths:
+                log(f"Not renaming '{file_path.name}', another file is already being renamed to '{new_name}'", "warning")
+                continue
+            new_paths.add(new_path)
+            renames[file_path] = new_path
+
+        self.podcast.analyzer.update_file_paths(self.move_files(renames))
 
     def get_new_name(self, name, file_path):
         """
@@ -42,57 +221,58 @@ class FileOrganizer:
         :param file_path: The path to the file.
         :return: The new name of the file.
         """
-        new_name = perform_replacements(name, self.config.get('file_replacements', []))
+        new_name = apply_replacements(name, self.file_replacements)
         if new_name != name:
             log(f"Renaming '{file_path.name}' to '{new_name}'", "debug")
 
-        return file_path.with_name(new_name)
+        return new_name
     
-    def fix_episode_numbering(self, file_path, ep_nr_at_end_file_pattern):
+    def fix_episode_numbering(self, name, ep_nr_at_end_file_pattern):
         """
         Fix the episode numbering in the file name.
 
-        :param file_path: The path to the file.
+        :param name: The name of the file.
         :param ep_nr_at_end_file_pattern: The compiled pattern to match episode numbers at the end of the file name.
+        :return: The name with the episode number moved in front of the title.
         """
-        match = ep_nr_at_end_file_pattern.match(file_path.name)
+        match = ep_nr_at_end_file_pattern.match(name)
         if match:
             prefix = match.group(1)
             date_part = match.group(2)
             title = match.group(3).rstrip(' -').strip()
             episode_number = match.group(5)
             extension = match.group(8)
-            new_filename = f"{prefix}{date_part} {episode_number} - {title}{extension}"
-            new_path = file_path.with_name(new_filename)
-
-            file_path.rename(new_path)
-            file_path = new_path
+            name = f"{prefix}{date_part} {episode_number} - {title}{extension}"
 
-        return file_path
+        return name
 
-    def rename_file(self, file_path, ep_nr_at_end_file_pattern):
+    def get_file_name(self, file_path, ep_nr_at_end_file_pattern):
         """
-        Rename an individual episode file.
+        Get the new name for an individual episode file.
 
         :param file_path: The path to the file.
         :param ep_nr_at_end_file_pattern: The pattern to match episode numbers at the end of the file name.
+        :return: The new name of the file.
         """
         new_name = titlecase_filename(file_path, self.config)
-
-        new_path = self.get_new_name(new_name, file_path)
-        file_path.rename(new_path)
-        file_path = new_path
-
-        return self.fix_episode_numbering(file_path, ep_nr_at_end_file_pattern)
+        new_name = self.get_new_name(new_name, file_path)
+        return self.fix_episode_numbering(new_name, ep_nr_at_end_file_pattern)
 
     def update_file_metadata(self):
         """
         Update metadata fields in audio files based on the 'file_metadata_replacements' configuration.
         """
-        replacements = self.config.get('file_metadata_replacements', [])
+        # compile the patterns once, not for every field of every file
+        replacements = []
+        for replacement in self.config.get('file_metadata_replacements', []):
+            if not replacement.get('pattern'):
+                log(f"Invalid file metadata replacement: {replacement}", "error")
+                continue
+            pattern = re.compile(replacement['pattern'], get_regex_flags(replacement.get('flags', [])))
+            replacements.append((replacement.get('fields', []), pattern, replacement.get('replacement', '')))
 
-        for file_path in Path(self.podcast.folder_path).rglob('*'):
-            if file_path.suffix.lower() in ['.mp3', '.m4a']:
+        for file_path in self.get_files():
+            if file_path.suffix.lower() in AUDIO_EXTENSIONS:
                 try:
                     if file_path.suffix.lower() == '.mp3':
                         audio = EasyID3(file_path)
@@ -103,48 +283,23 @@ class FileOrganizer:
 
                     metadata_changed = False
 
-                    for replacement in replacements:
-                        fields = replacement.get('fields', [])
-                        pattern = replacement.get('pattern', None)
-                        repl = replacement.get('replacement', '')
-                        flags = replacement.get('flags', [])
-                        regex_flags = 0
-                        flag_mapping = {
-                            'IGNORECASE': re.IGNORECASE,
-                            'MULTILINE': re.MULTILINE,
-                            'DOTALL': re.DOTALL,
-                            'VERBOSE': re.VERBOSE,
-                            'ASCII': re.ASCII,
-                        }
-                        for flag in flags:
-                            regex_flags |= flag_mapping.get(flag.upper(), 0)
-
+                    for fields, pattern, repl in replacements:
                         for field in fields:
                             # Handle MP3 files
                             if file_path.suffix.lower() == '.mp3':
                                 if field in audio:
                                     original_value = audio[field][0]
-                                    new_value = re.sub(pattern, repl, original_value, flags=regex_flags).strip()
+                                    new_value = pattern.sub(repl, original_value).strip()
                                     if new_value != original_value:
                                         audio[field] = new_value
                                         metadata_changed = True
                                         log(f"Updated '{field}' metadata in '{file_path.name}' from '{original_value}' to '{new_value}'", "debug")
                             # Handle M4A files
                             elif file_path.suffix.lower() == '.m4a':
-                                tag_map = {
-                                    'title': '\xa9nam',
-                                    'artist': '\xa9ART',
-                                    'album': '\xa9alb',
-                                    'genre': '\xa9gen',
-                                    'date': '\xa9day',
-                                    'comment': '\xa9cmt',
-                                    'composer': '\xa9wrt',
-                                    'albumartist': 'aART',
-                                }
-                                mp4_field = tag_map.get(field.lower())
+                                mp4_field = MP4_TAGS.get(field.lower())
                                 if mp4_field and mp4_field in audio.tags:
                                     original_value = audio.tags[mp4_field][0]
-                                    new_value = re.sub(pattern, repl, original_value, flags=regex_flags).strip()
+                                    new_value = pattern.sub(repl, original_value).strip()
                                     if new_value != original_value:
                                         audio.tags[mp4_field] = [new_value]
                                         metadata_changed = True
@@ -160,57 +315,66 @@ class FileOrganizer:
         Find and remove unwanted files from the podcast folder.
         """
         announce("Checking if there are episodes we don't want", "info")
-        for file_path in Path(self.podcast.folder_path).rglob('*'):
-            if file_path.is_file() and any(unwanted_file.lower() in file_path.name.lower() for unwanted_file in self.unwanted_files):
+        unwanted = []
+        for file_path, name in self.get_files().items():
+            if self.unwanted_regex and self.unwanted_regex.search(name):
                 if ask_yes_no(f"Would you like to remove '{file_path.name}'"):
-                    file_path.unlink()
-                    self.podcast.analyzer.remove_file(file_path)
+                    unwanted.append(file_path)
+
+        for file_path in self.delete_files(unwanted):
+            self.podcast.analyzer.remove_file(file_path)
 
     def pad_episode_numbers(self):
         """
         Pad episode numbers with zeros to make them consistent
         """
-        pattern = re.compile(self.config.get('episode_pattern', r'(Ep\.?|Episode|E|Part)(\s*)(\d+)'), re.IGNORECASE)
+        pattern = self.episode_pattern
 
         files_with_episodes = []
 
-        for filename in Path(self.podcast.folder_path).rglob('*'):
-            match = pattern.search(filename.name)
-            if match:
-                episode_number = int(match.group(3))
-                files_with_episodes.append((filename, episode_number))
+        for filename in self.get_files():
+            # remember where the numbers are, so padding doesn't need a second regex pass
+            matches = list(pattern.finditer(filename.name))
+            if matches:
+                episode_number = int(matches[0].group(3))
+                files_with_episodes.append((filename, [match.span(3) for match in matches], episode_number))
 
         if not files_with_episodes:
             log("No files with episode numbers found", "debug")
             return
 
-        max_episode_number = max(ep_num for _, ep_num in files_with_episodes)
+        max_episode_number = max(ep_num for _, _, ep_num in files_with_episodes)
         num_digits = len(str(max_episode_number))
 
-        def pad_episode_number(match):
-            prefix = match.group(1)
-            space = match.group(2)
-            episode_number = int(match.group(3))
-            padded_episode = str(episode_number).zfill(num_digits)
-            return f"{prefix}{space}{padded_episode}"
-
-        for filename, _ in files_with_episodes:
-            new_filename = pattern.sub(pad_episode_number, filename.name)
-            new_path = filename.with_name(new_filename)
-
-            filename.rename(new_path)
+        renames = {}
+        for filename, spans, _ in files_with_episodes:
+            name = filename.name
+            parts = []
+            position = 0
+            for start, end in spans:
+                parts.append(name[position:start])
+                parts.append(str(int(name[start:end])).zfill(num_digits))
+                position = end
+            parts.append(name[position:])
+            new_filename = ''.join(parts)
+            if new_filename != name:
+                renames[filename] = filename.with_name(new_filename)
+
+        moved = self.move_files(renames)
+        for filename, new_path in moved:
             log(f"Renamed '{filename}' to '{new_path}'", "debug")
+        self.podcast.analyzer.update_file_paths(moved)
 
     def find_files_without_episode_numbers(self):
         """
         Find files that share the same date but have no episode number.
         """
-        date_pattern = re.compile(self.config.get('date_pattern', r'\b(\d{4}-\d{2}-\d{2})\b'))
-        episode_pattern = re.compile(self.config.get('episode_pattern', r'(Ep\.?|Episode)\s*(\d+)'), re.IGNORECASE)
+        date_pattern = self.date_pattern
+        episode_pattern = self.missing_episode_pattern
 
         files_by_date = {}
 
-        for filename in Path(self.podcast.folder_path).rglob('*'):
+        for filename in self.get_files():
             date_match = date_pattern.search(filename.name)
             if date_match:
                 date = date_match.group(1)
@@ -230,7 +394,8 @@ class FileOrganizer:
             if files_missing_episode:
                 files_without_episode_numbers[date] = files_missing_episode
 
-        log(f"Files without episode numbers: {files_without_episode_numbers}", "debug")
+        if debug_enabled():
+            log(f"Files without episode numbers: {files_without_episode_numbers}", "debug")
 
         return files_without_episode_numbers
     
@@ -242,32 +407,27 @@ class FileOrganizer:
         episode_titles.reverse()
         filename_format = self.config.get('conflicing_dates_replacement', '{prefix} - {date} Ep. {episode} - {suffix}')
         has_trailer = False
-        trailer_patterns = self.config.get('trailer_patterns', [])
-        trailer_regex = re.compile('|'.join([re.escape(pattern) for pattern in trailer_patterns]), re.IGNORECASE)
-        if episode_titles and trailer_regex.search(episode_titles[0]):
+        if episode_titles and self.trailer_regex and self.trailer_regex.search(episode_titles[0]):
             log(f"The first episode '{episode_titles[0]}' matches a trailer pattern, adjusting episode numbers -1.", "debug")
             has_trailer = True
+        normalized_titles = [normalize_string(title) for title in episode_titles]
 
         for date, files in files_without_episode_numbers.items():
             max_episode_number = len(episode_titles)
             num_digits = len(str(max_episode_number))
+            date_regex = re.compile(rf'\b{re.escape(date)}\b ')
 
             for index, file_path in enumerate(files):
                 normalized_filename = normalize_string(file_path.name)
-                for episode_number, title in enumerate(episode_titles, start=1):
-                    if has_trailer:
-                        episode_number -= 1
-                    normalized_title = normalize_string(title)
+                for episode_number, normalized_title in enumerate(normalized_titles, start=0 if has_trailer else 1):
                     if normalized_title in normalized_filename:
                         padded_episode = str(episode_number).zfill(num_digits)
 
-                        original_title = re.sub(rf'\b{date}\b ', '', file_path.name).strip()
-                        title_parts = re.split(self.config.get('title_split_pattern', r' - (?=[^-]*$)'), original_title)
+                        original_title = date_regex.sub('', file_path.name).strip()
+                        title_parts = self.title_split_pattern.split(original_title)
                         
                         new_filename = filename_format.format(prefix=title_parts[0].strip(), date=date, episode=padded_episode, suffix=title_parts[1].strip())
-                        new_path = file_path.with_name(new_filename)
-
-                        file_path.rename(new_path)
+                        new_path = self.move_file(file_path, file_path.with_name(new_filename))
                         log(f"Renamed '{file_path}' to '{new_path}'", "debug")
                         self.podcast.analyzer.update_file_path(file_path, new_path)
                         break
@@ -281,20 +441,24 @@ class FileOrganizer:
         conflicting_episodes = self.find_files_without_episode_numbers()
         if conflicting_episodes:
             self.assign_episode_numbers_from_rss(conflicting_episodes)
-        pattern = re.compile(self.config.get('numbered_episode_pattern', r'^(.* - )(\d{4}-\d{2}-\d{2}) (\d+)\. (.*)(\.\w+)'))
-    
-        files = Path(self.podcast.folder_path).rglob('*')
-        has_episode_number = any(pattern.match(f.name) for f in files)
+        pattern = self.numbered_episode_pattern
+
+        # one pass collects both whether any file is numbered and which ones aren't
+        has_episode_number = False
+        missing_episode_number = []
+        for f in self.get_files():
+            if pattern.match(f.name):
+                has_episode_number = True
+            else:
+                missing_episode_number.append(f)
         if has_episode_number:
-            missing_episode_number = [f for f in files if not pattern.match(f.name)]
             if missing_episode_number:
                 for f in missing_episode_number:
-                    if (f.is_file() and not fnmatch.fnmatch(f.name, '*.mp3') and not fnmatch.fnmatch(f.name, '*.m4a')) or not f.is_file():
+                    if f.suffix.lower() not in AUDIO_EXTENSIONS:
                         continue
                     episode_number = take_input(f"Episode number for '{f}' (blank skips)")
                     if episode_number:
-                        original_pattern = re.compile(self.config.get('numbered_episode_pattern', r'^(.*) - (\d{4}-\d{2}-\d{2}) (.*?)(\.\w+)'))
-                        match = original_pattern.match(f.name)
+                        match = self.unnumbered_episode_pattern.match(f.name)
                         
                         if match:
                             prefix = match.group(1)
@@ -303,13 +467,7 @@ class FileOrganizer:
                             extension = match.group(4)
 
                             new_filename = f"{prefix} - {date_part} {episode_number}. {title}{extension}"
-
-                            folder_path = Path(folder_path)
-
-                            old_filepath = folder_path / f
-                            new_filepath = folder_path / new_filename
-
-                            old_filepath.rename(new_filepath)
+                            self.move_file(f, f.with_name(new_filename))
 
     def check_split(self):
         """
@@ -344,16 +502,21 @@ class FileOrganizer:
     
         if not current_folder.exists():
             current_folder.mkdir()
-        
-        for date, year_list in self.podcast.analyzer.file_dates.items():
-            year = int(date[:4])
-            if year == current_year:
+        # one listing instead of a stat per file
+        existing = set(os.listdir(current_folder))
+
+        # compare the date strings directly, this also skips files with an unknown date
+        current_year_prefix = str(current_year)
+        # moving files changes the analyzer's dates, so loop over a copy
+        for date, year_list in list(self.podcast.analyzer.file_dates.items()):
+            if date[:4] == current_year_prefix:
                 for file_path in year_list[:]:
-                    if not file_path.exists():
-                        log(f"File '{file_path}' does not exist", "debug")
-                        continue
                     new_path = current_folder / file_path.name
-                    if new_path.exists():
+                    if file_path.name in existing:
+                        # only worth a stat before deleting the file it would replace
+                        if not file_path.exists():
+                            log(f"File '{file_path}' does not exist", "debug")
+                            continue
                         log(f"File '{new_path}' already exists", "debug")
                         if not ask_yes_no(f"'{new_path.name}' already exists, overwritet?"):
                             log("Skipping file", "debug")
@@ -361,7 +524,12 @@ class FileOrganizer:
                         log("Deleting file", "debug")
                         new_path.unlink()
 
-                    file_path.rename(new_path)
+                    try:
+                        file_path.rename(new_path)
+                    except FileNotFoundError:
+                        log(f"File '{file_path}' does not exist", "debug")
+                        continue
+                    existing.add(file_path.name)
                     log(f"Moved '{file_path}' to '{new_path}'", "debug")
                     self.podcast.analyzer.remove_file(file_path)
 
@@ -378,6 +546,7 @@ class FileOrganizer:
         """
         Organize the episode files in the podcast folder.
         """
+        self.files = None
         self.check_split()
         self.rename_folder()
         with spinner("Organizing episode files") as spin:
@@ -396,18 +565,26 @@ class FileOrganizer:
             return
         date_format_short = self.config.get('date_format_short', '%Y-%m-%d')
         date_format_long = self.config.get('date_format_long', '%B %d %Y')
-        start_year_str = str(self.podcast.analyzer.earliest_year) if self.podcast.analyzer.earliest_year else "Unknown"
-        real_start_year_str = str(self.podcast.analyzer.real_first_episode_date)[:4] if self.podcast.analyzer.real_first_episode_date else "Unknown"
-        first_episode_date_str = format_last_date(self.podcast.analyzer.first_episode_date, date_format_long) if self.podcast.analyzer.first_episode_date else "Unknown"
-        last_episode_date_str = format_last_date(self.podcast.analyzer.last_episode_date, date_format_long) if self.podcast.analyzer.last_episode_date else "Unknown"
-        last_episode_date_dt = datetime.strptime(self.podcast.analyzer.last_episode_date, date_format_short) if self.podcast.analyzer.last_episode_date != "Unknown" else None
-        real_last_episode_date_dt = datetime.strptime(self.podcast.analyzer.real_last_episode_date, date_format_short) if self.podcast.analyzer.real_last_episode_date != "Unknown" else None
-        last_year_str = str(last_episode_date_dt.year) if last_episode_date_dt else "Unknown"
+        analyzer = self.podcast.analyzer
+
+        # dates are only parsed and formatted once a question actually needs them
+        def to_datetime(date_str):
+            return parse_date(date_str, date_format_short) if date_str and date_str != "Unknown" else None
+
+        def to_long_date(date_str):
+            return format_last_date(date_str, date_format_long) if date_str else "Unknown"
+
+        start_year_str = str(analyzer.earliest_year) if analyzer.earliest_year else "Unknown"
+        last_episode_date_dt = to_datetime(analyzer.last_episode_date)
         new_folder_name = None
-        if real_last_episode_date_dt != last_episode_date_dt:
+        if to_datetime(analyzer.real_last_episode_date) != last_episode_date_dt:
+            last_year_str = str(last_episode_date_dt.year) if last_episode_date_dt else "Unknown"
             if ask_yes_no(f'Would you like to rename the folder to {self.podcast.name} ({start_year_str}-{last_year_str})'):
                 new_folder_name = f"{self.podcast.name} ({start_year_str}-{last_year_str})"
+        real_start_year_str = str(analyzer.real_first_episode_date)[:4] if analyzer.real_first_episode_date else "Unknown"
         if not new_folder_name and start_year_str != real_start_year_str:
+            first_episode_date_str = to_long_date(analyzer.first_episode_date)
+            last_episode_date_str = to_long_date(analyzer.last_episode_date)
             if ask_yes_no(f'Would you like to rename the folder to {self.podcast.name} ({first_episode_date_str}-{last_episode_date_str})'):
                 new_folder_name = f"{self.podcast.name} ({first_episode_date_str}-{last_episode_date_str})"
         if not new_folder_name and last_episode_date_dt and datetime.now() - last_episode_date_dt > timedelta(days=self.config.get('completed_threshold_days', 365)):
@@ -415,6 +592,7 @@ class FileOrganizer:
                 new_folder_name = f"{self.podcast.name} (Complete)"
                 self.podcast.completed = True
         if not new_folder_name:
+            last_episode_date_str = to_long_date(analyzer.last_episode_date)
             if ask_yes_no(f'Would you like to rename the folder to {self.podcast.name} ({start_year_str}-{last_episode_date_str})'):
                 new_folder_name = f"{self.podcast.name} ({start_year_str}-{last_episode_date_str})"
         if not new_folder_name:
@@ -2,13 +2,14 @@
 import re
 import shutil
 import hashlib
+from functools import cached_property
 from .file_organizer import FileOrganizer
 from .file_analyzer import FileAnalyzer
 from .dupe_checker import DupeChecker
 from .rss import Rss
 from .podcast_image import PodcastImage
 from .podcast_metadata import PodcastMetadata
-from .utils import log, run_command, announce, spinner, get_metadata_directory, convert_paths_to_strings
+from .utils import log, run_command, announce, spinner, get_metadata_directory
 from .database import Database
 
 class Podcast:
@@ -42,10 +43,27 @@ class Podcast:
         self.image = PodcastImage(self, self.config)
         self.metadata = PodcastMetadata(self, self.config)
         self.analyzer = FileAnalyzer(self, config)
-        self.db = Database(config.get('database', {}).get('file', './podcasts.db'))
+        self.clean_name_regex = re.compile(config.get('clean_name', r'^(.*?)(?=\()'))
+        # the name can still change once the RSS metadata is read, so these are keyed on it
+        self._clean_name_cache = (None, None)
+        self._hash_cache = (None, None)
         if self.name != 'unknown podcast' and check_duplicates:
             self.check_for_duplicates()
 
+    @cached_property
+    def db(self):
+        """
+        The podcast database, only opened once it is used.
+        """
+        return Database(self.config.get('database', {}).get('file', './podcasts.db'))
+
+    def close_database(self):
+        """
+        Close the podcast database, if it was opened.
+        """
+        if 'db' in self.__dict__:
+            self.db.close()
+
     def get_metadata(self, critical=True):
         """
         Get the podcast metadata.
@@ -143,6 +161,14 @@ class Podcast:
         hash = self.get_hash()
         podcast_data = self.db.get_podcast(hash)
 
+        if not podcast_data:
+            # rows written before the switch to BLAKE2 are keyed on the MD5 hash, move them over
+            legacy_hash = self.get_legacy_hash()
+            if self.db.get_podcast(legacy_hash):
+                self.db.rename_podcast(legacy_hash, hash)
+                log(f"Moved podcast {self.name} to its new database hash.", "debug")
+                podcast_data = self.db.get_podcast(hash)
+
         if not podcast_data:
             log(f"Podcast {self.name} not found in the database.", "debug")
             return
@@ -162,12 +188,11 @@ class Podcast:
         """
         hash = self.get_hash()
 
-        if refresh:
-            log(f"Refresh is true, deleting podcast {self.name} from the database.", "debug")
-            self.db.delete_podcast(hash)
-        
-        files = convert_paths_to_strings(self.analyzer.file_dates)
-        self.db.insert_podcast(hash, files)
+        with self.db.batch():
+            if refresh:
+                log(f"Refresh is true, deleting podcast {self.name} from the database.", "debug")
+                self.db.delete_podcast(hash)
+            self.db.insert_podcast(hash, self.analyzer.file_dates)
         log(f"Podcast {self.name} added to the database.", "debug")
 
     def add_metadata_to_database(self):
@@ -188,11 +213,12 @@ class Podcast:
 
         :return: The clean name of the podcast.
         """
-        match = re.search(self.config.get('clean_name', r'^(.*?)(?=\()'), self.name)
-
-        if not match:
-            return self.name
-        return match.group(1).strip()
+        name, clean_name = self._clean_name_cache
+        if name != self.name:
+            match = self.clean_name_regex.search(self.name)
+            clean_name = match.group(1).strip() if match else self.name
+            self._clean_name_cache = (self.name, clean_name)
+        return clean_name
 
     def get_hash(self):
         """
@@ -200,4 +226,17 @@ class Podcast:
 
         :return: The hash of the podcast.
         """
-        return hashlib.md5(self.get_clean_name().encode('utf-8')).hexdigest()
+        clean_name = self.get_clean_name()
+        name, hash = self._hash_cache
+        if name != clean_name:
+            hash = hashlib.blake2b(clean_name.encode('utf-8'), digest_size=16, usedforsecurity=False).hexdigest()
+            self._hash_cache = (clean_name, hash)
+        return hash
+
+    def get_legacy_hash(self):
+        """
+        Get the MD5 hash the podcast was stored under by earlier versions.
+
+        :return: The legacy hash of the podcast.
+        """
+        return hashlib.md5(self.get_clean_name().encode('utf-8'), usedforsecurity=False).hexdigest()
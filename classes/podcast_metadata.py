@@ -24,6 +24,14 @@ class PodcastMetadata:
         self.external_data = {}
         self.has_data = False
         self.archive = config.get('archive_metadata', False)
+        self.formatter = DataFormatter(config)
+        # the folder can be renamed, so the file is kept together with the folder it was found in
+        self.file_path = (None, None)
+        # the patterns are literal, expanding the replacement once (e.g. '\\n' to a newline) lets str.replace do the work
+        self.description_replacements = [
+            (replacement['pattern'], re.compile(re.escape(replacement['pattern'])).match(replacement['pattern']).expand(replacement['replace_with']))
+            for replacement in config.get('description_replacements', [])
+        ]
 
     def get_file_path(self):
         """
@@ -31,12 +39,17 @@ class PodcastMetadata:
 
         :return: The path to the metadata file.
         """
+        folder_path, file_path = self.file_path
+        if file_path and folder_path == self.podcast.folder_path:
+            return file_path
         meta_files = find_case_insensitive_files('*.meta.*', self.podcast.folder_path)
         if not meta_files:
             return None
         file_path = self.podcast.folder_path / meta_files[0].name
         if not file_path.exists():
             return None
+        # only a found file is kept, the metadata file can still be downloaded later
+        self.file_path = (self.podcast.folder_path, file_path)
         return file_path
 
     def load(self, search_term=None):
@@ -57,10 +70,10 @@ class PodcastMetadata:
             return None
         status = None
         try:
-            with file_path.open() as f:
-                self.data = json.load(f)
-                self.has_data = True
-                status = True
+            # one read, json parses the bytes without a text wrapper in between
+            self.data = json.loads(file_path.read_bytes())
+            self.has_data = True
+            status = True
         except json.JSONDecodeError:
             log(f"Invalid JSON in file '{file_path.name}'.", "error")
             log(json.JSONDecodeError.msg, "debug")
@@ -86,9 +99,8 @@ class PodcastMetadata:
         """
         Format the metadata data using the DataFormatter.
         """
-        formatter = DataFormatter(self.config)
-        self.data = formatter.format_data(self.data)
-        self.external_data = formatter.format_data(self.external_data)
+        self.data = self.formatter.format_data(self.data)
+        self.external_data = self.formatter.format_data(self.external_data)
         
     def fetch_additional_data(self, search_term=None):
         """
@@ -106,12 +118,8 @@ class PodcastMetadata:
         :param description: The description to replace parts of.
         :return: The description with replacements made.
         """
-        replacements = self.config.get('description_replacements', [])
-        for replacement in replacements:
-            pattern = replacement['pattern']
-            repl = replacement['replace_with']
-            escaped_pattern = re.escape(pattern)
-            description = re.sub(escaped_pattern, repl, description)
+        for pattern, repl in self.description_replacements:
+            description = description.replace(pattern, repl)
         if description and description[0] == '\n':
             description = description[1:]
         if description and description[-1] == '\n':
@@ -145,8 +153,12 @@ class PodcastMetadata:
         links = {}
         if 'link' in self.data:
             links['Official Website'] = self.data['link'].strip()
-        links['Podnews'] = 'https://podnews.net/podcast/123'
-        links['Podcastindex.org'] = 'https://podcastindex.org/podcast/123'
+        podnews_url = self.external_data.get('podnews', {}).get('url')
+        if podnews_url:
+            links['Podnews'] = podnews_url
+        podcastindex_id = self.external_data.get('podcastindex', {}).get('id')
+        if podcastindex_id:
+            links['Podcastindex.org'] = f'https://podcastindex.org/podcast/{podcastindex_id}'
 
         return links
 
@@ -164,16 +176,13 @@ class PodcastMetadata:
         
         categories = self.data['itunes']['categories']
 
-        processed_categories = []
-        for category in categories:
-            parts = category.lower().split('&')
-            processed_categories.extend([part.strip() for part in parts])
+        # a dict drops repeated tags (e.g. a category and its subcategory) but keeps the order
+        tags = dict.fromkeys(part.strip() for category in categories for part in category.lower().split('&'))
 
-        if 'explicit' in self.data['itunes']:
-            if self.data['itunes']['explicit'] == 'yes':
-                processed_categories.append('explicit')
+        if self.data['itunes'].get('explicit') == 'yes':
+            tags['explicit'] = None
 
-        return ', '.join(processed_categories)
+        return ', '.join(tags)
 
     def get_rss_feed(self):
         """
@@ -222,13 +231,14 @@ class PodcastMetadata:
 
         :param search_term: The search term to use for finding the podcast.
         """
+        api_config = self.config.get('podchaser', {})
         return self.get_external_data(
             'podchaser',
             Podchaser,
             search_term,
-            self.config.get('podchaser', {}).get('token', None),
-            self.config.get('podchaser', {}).get('fields', None),
-            self.config.get('podchaser', {}).get('url', None)
+            api_config.get('token'),
+            api_config.get('fields'),
+            api_config.get('url')
         )
     
     def get_podcastindex_data(self, search_term=None):
@@ -237,13 +247,14 @@ class PodcastMetadata:
 
         :param search_term: The search term to use for finding the podcast.
         """
+        api_config = self.config.get('podcastindex', {})
         return self.get_external_data(
             'podcastindex',
             Podcastindex,
             search_term,
-            self.config.get('podcastindex', {}).get('key', None),
-            self.config.get('podcastindex', {}).get('secret', None),
-            self.config.get('podcastindex', {}).get('url', None)
+            api_config.get('key'),
+            api_config.get('secret'),
+            api_config.get('url')
         )
     
     def get_podnews_data(self, search_term=None):
@@ -252,11 +263,12 @@ class PodcastMetadata:
 
         :param search_term: The search term to use for finding the podcast.
         """
+        api_config = self.config.get('podnews', {})
         return self.get_external_data(
             'podnews',
             Podnews,
             search_term,
-            self.config.get('podnews', {}).get('url', None)
+            api_config.get('url')
         )
     
     def archive_file(self):
@@ -274,12 +286,14 @@ class PodcastMetadata:
         if not self.archive:
             log(f"Deleting meta {file_path.name}", "debug")
             file_path.unlink()
+            self.file_path = (None, None)
             return
 
         archive_folder = self.config.get('archive_metadata_directory', None)
         archive_metadata(file_path, archive_folder)
         log(f"Deleting meta {file_path.name}", "debug")
         file_path.unlink()
+        self.file_path = (None, None)
 
     def duplicate(self, new_folder):
         """
@@ -298,7 +312,9 @@ class PodcastMetadata:
         log(f"Duplicated meta {file_path.name} to {new_file_path}", "debug")
 
     def get_external_ids(self):
-        ids = []
-        for dataset in self.external_data.values():
-            ids.append(dataset.get('id'))
-        return ids
+        """
+        Get the ids of the podcast at the external sources it was found at.
+
+        :return: The external ids, sources without an id are left out.
+        """
+        return [external_id for dataset in self.external_data.values() if (external_id := dataset.get('id')) is not None]
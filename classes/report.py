@@ -1,7 +1,7 @@
 # report.py
 from collections import Counter
 from pathlib import Path
-from .utils import spinner, log, format_last_date, ask_yes_no, take_input
+from .utils import spinner, log, debug_enabled, format_last_date, ask_yes_no, take_input
 from .report_template import ReportTemplate
 
 class Report:
@@ -139,7 +139,8 @@ class Report:
                 "name_clean": self.podcast.name,
                 "premium_show": self.podcast.rss.check_for_premium_show(),
             }
-            log(f"Data for the name: {data}", "debug")
+            if debug_enabled():
+                log(f"Data for the name: {data}", "debug")
             name = template.get_name(data)
             if name:
                 data['name'] = name
@@ -203,7 +204,8 @@ class Report:
                 for site, external_data in self.podcast.metadata.external_data.items():
                     data[site] = external_data
 
-            log(f"Data passed to the template: {data}", "debug")
+            if debug_enabled():
+                log(f"Data passed to the template: {data}", "debug")
 
             with open(output_filename, 'w') as f:
                 log(f"Writing report to {output_filename}", "debug")
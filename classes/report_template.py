@@ -1,7 +1,34 @@
 # template.py
-from jinja2 import Template
+from functools import lru_cache
+from pathlib import Path
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
 from .utils import log
 
+@lru_cache(maxsize=None)
+def get_template_environment(cache_directory=None):
+    """
+    Get the template environment, templates are compiled once per run and reloaded only when the file changes.
+
+    :param cache_directory: The cache directory, compiled templates are kept there so later runs skip parsing them.
+    :return: The template environment.
+    """
+    bytecode_cache = None
+    # the cache directory is only used if it's already there, rendering a report shouldn't create it
+    if cache_directory and Path(cache_directory).is_dir():
+        bytecode_cache = FileSystemBytecodeCache(str(cache_directory), 'jinja2-%s.cache')
+    return Environment(loader=FileSystemLoader('templates'), bytecode_cache=bytecode_cache)
+
+@lru_cache(maxsize=None)
+def get_string_template(environment, source):
+    """
+    Compile a template from a string, once per distinct source.
+
+    :param environment: The template environment.
+    :param source: The template source.
+    :return: The compiled template.
+    """
+    return environment.from_string(source)
+
 class ReportTemplate:
     def __init__(self, podcast, config):
         """
@@ -16,19 +43,19 @@ class ReportTemplate:
         self.config = config
         self.template_file = config.get('template_file', 'default')
         self.name_template_file = config.get('name_template_file', 'default')
-        self.template = None
-        with open(f"templates/{self.template_file}.tpl", "r") as template_file:
-            self.template = Template(template_file.read())
-        if not self.template:
+        environment = get_template_environment(config.get('cache', {}).get('directory', None))
+        try:
+            self.template = environment.get_template(f"{self.template_file}.tpl")
+        except TemplateNotFound:
             log(f"Template {self.template_file} not found. Will only include description.", "warning")
-            self.template = Template("{{ description }}")
-        with open(f"templates/{self.name_template_file}.tpl", "r") as template_file:
-            self.name_template = Template(template_file.read())
-        if not self.name_template:
-            log(f"Template {self.template_file} not found. Name will only be podcast name.", "warning")
-            self.name_template = Template("{{ podcast_name }}")
-        self.link_template = Template(config.get('link_template', '{{ link }}'))
-        self.links_section_template = Template(config.get('links_section_template', '{{ links }}'))
+            self.template = get_string_template(environment, "{{ description }}")
+        try:
+            self.name_template = environment.get_template(f"{self.name_template_file}.tpl")
+        except TemplateNotFound:
+            log(f"Template {self.name_template_file} not found. Name will only be podcast name.", "warning")
+            self.name_template = get_string_template(environment, "{{ podcast_name }}")
+        self.link_template = get_string_template(environment, config.get('link_template', '{{ link }}'))
+        self.links_section_template = get_string_template(environment, config.get('links_section_template', '{{ links }}'))
 
     def get_name(self, data):
         """
@@ -46,11 +73,8 @@ class ReportTemplate:
         :param links: A dictionary containing key-value pairs that match placeholders in the template.
         :return: A string with the formatted links section.
         """
-        links_str = ""
-        for key, value in links.items():
-            links_str += self.link_template.render({"link": value, "text": key}) + "\n"
         data = {
-            "links": links_str[:-1]
+            "links": "\n".join(self.link_template.render({"link": value, "text": key}) for key, value in links.items())
         }
         return self.links_section_template.render(data)
 
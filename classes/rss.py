@@ -1,12 +1,18 @@
 # rss.py
 import re
-import os
 import shutil
-import xml.etree.ElementTree as ET
+from functools import partial
+try:
+    from lxml import etree as ET
+    # feeds come from the internet, never expand their entities
+    XML_PARSER = ET.XMLParser(resolve_entities=False)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    XML_PARSER = None
 from pathlib import Path
 from titlecase import titlecase
 from .utils import spinner, get_metadata_directory, log, find_case_insensitive_files, copy_file, download_file
-from .utils import special_capitalization, archive_metadata, ask_yes_no, announce, perform_replacements
+from .utils import special_capitalization, archive_metadata, ask_yes_no, announce, perform_replacements, atomic_write
 
 class Rss:
     def __init__(self, podcast, source_rss_file, config, censor_rss):
@@ -27,6 +33,20 @@ class Rss:
         self.keep_source_rss = self.config.get('keep_source_rss', False)
         self.archive = config.get('archive_metadata', False)
         self.metadata = dict()
+        self.tree = (None, None, None)
+        # the folder can be renamed, so the file is kept together with the folder it was found in
+        self.file_path = (None, None)
+        self.titlecase_callback = partial(special_capitalization, config=config, previous_word=None)
+        # the folder name is asked for more than once, keyed on the raw feed title
+        self.folder_name = (None, None)
+
+    def default_file_name(self):
+        """
+        Get the default name of the RSS feed file.
+
+        :return: The default name of the RSS feed file.
+        """
+        return 'podcast.rss' if self.podcast.name == 'unknown podcast' else f'{self.podcast.name}.rss'
 
     def default_file_path(self):
         """
@@ -34,8 +54,7 @@ class Rss:
 
         :return: The default path to the RSS feed file.
         """
-        file_name = 'podcast.rss' if self.podcast.name == 'unknown podcast' else f'{self.podcast.name}.rss'
-        return get_metadata_directory(self.podcast.folder_path, self.config) / file_name
+        return get_metadata_directory(self.podcast.folder_path, self.config) / self.default_file_name()
 
     def get_file_path(self):
         """
@@ -43,15 +62,51 @@ class Rss:
         
         :return: The path to the RSS feed file.
         """
+        folder_path, file_path = self.file_path
+        if file_path and folder_path == self.podcast.folder_path:
+            return file_path
         metadata_directory = get_metadata_directory(self.podcast.folder_path, self.config)
-        if not metadata_directory.exists():
-            return None
-        if self.default_file_path().exists():
-            return self.default_file_path()
-        rss_file = find_case_insensitive_files('*.rss', get_metadata_directory(self.podcast.folder_path, self.config))
-        if not rss_file:
-            return None
-        return rss_file[0]
+        file_path = metadata_directory / self.default_file_name()
+        if not file_path.exists():
+            # a missing metadata directory shows up when it is scanned, without a separate check
+            try:
+                rss_file = find_case_insensitive_files('*.rss', metadata_directory)
+            except FileNotFoundError:
+                return None
+            if not rss_file:
+                return None
+            file_path = rss_file[0]
+        self.file_path = (self.podcast.folder_path, file_path)
+        return file_path
+
+    def get_tree(self):
+        """
+        Get the parsed RSS feed file.
+
+        The tree is kept until the file is replaced or changes on disk.
+
+        :return: The parsed ElementTree.
+        """
+        file_path = self.get_file_path()
+        stat = file_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached_path, cached_key, tree = self.tree
+        if cached_path != file_path or cached_key != key:
+            tree = ET.parse(file_path, XML_PARSER)
+            self.tree = (file_path, key, tree)
+        return tree
+
+    def get_channel(self):
+        """
+        Get the channel element of the parsed RSS feed.
+
+        :return: The channel element, or None if the feed has none.
+        """
+        root = self.get_tree().getroot()
+        # in RSS 2.0 the channel is the only child of the root
+        if len(root) and root[0].tag == 'channel':
+            return root[0]
+        return root.find('channel')
 
     def extract_folder_name(self):
         """
@@ -59,15 +114,17 @@ class Rss:
 
         :return: The folder name extracted from the RSS feed.
         """
-        tree = ET.parse(self.get_file_path())
-        root = tree.getroot()
-        channel = root.find('channel')
+        channel = self.get_channel()
         if channel is not None:
-            title = channel.find('title')
+            title = channel.findtext('title')
             if title is not None:
-                new_title = perform_replacements(title.text, self.config.get('title_replacements', [])).strip()
-                return titlecase(new_title, callback=lambda word, **kwargs: special_capitalization(word, self.config, None, **kwargs))
-        return None 
+                raw_title, folder_name = self.folder_name
+                if raw_title != title:
+                    new_title = perform_replacements(title, self.config.get('title_replacements', [])).strip()
+                    folder_name = titlecase(new_title, callback=self.titlecase_callback)
+                    self.folder_name = (title, folder_name)
+                return folder_name
+        return None
 
     def get_episode_count_from(self):
         """
@@ -75,9 +132,7 @@ class Rss:
 
         :return: The episode count from the RSS feed.
         """
-        tree = ET.parse(self.get_file_path())
-        root = tree.getroot()
-        channel = root.find('channel')
+        channel = self.get_channel()
         if channel is not None:
             items = channel.findall('item')
             return len(items)
@@ -94,6 +149,7 @@ class Rss:
         new_file_path = get_metadata_directory(self.podcast.folder_path, self.config) / f'{self.podcast.name}.rss'
         log(f"Renaming RSS file from {old_file_path} to {new_file_path}", "debug")
         old_file_path.rename(new_file_path)
+        self.file_path = (None, None)
 
     def get_metadata_rename_folder(self):
         """
@@ -144,6 +200,7 @@ class Rss:
         """
         with spinner("Downloading RSS feed") as spin:
             result = download_file(self.source_rss_file, self.default_file_path())
+            self.file_path = (None, None)
             if result:
                 log(f"RSS feed downloaded to {self.default_file_path()}", "debug")
                 spin.ok("✔")
@@ -164,28 +221,33 @@ class Rss:
             return
 
         log(f"Removing episodes that don't match: {self.podcast.match_titles}", "debug")
-        tree = ET.parse(self.get_file_path())
-        root = tree.getroot()
-        channel = root.find('channel')
+        tree = self.get_tree()
+        channel = self.get_channel()
         if channel is not None:
-            items = channel.findall('item')
-            for item in items:
+            match_titles = re.compile(re.escape(self.podcast.match_titles), re.IGNORECASE)
+            # rebuild the children in one go, removing items one by one shifts the rest every time
+            removed = set()
+            for item in channel.findall('item'):
                 title_element = item.find('title')
-                if title_element is not None:
-                    if self.podcast.match_titles.lower() not in title_element.text.lower():
-                        channel.remove(item)
-        with self.get_file_path().open('w') as rss_file:
-            rss_file.write(ET.tostring(root, encoding='utf-8').decode('utf-8'))
+                if title_element is not None and not match_titles.search(title_element.text or ''):
+                    removed.add(item)
+            if removed:
+                channel[:] = [child for child in channel if child not in removed]
+        # serialize straight into the file, without a copy of the whole document in memory
+        with atomic_write(self.get_file_path()) as temp_path:
+            tree.write(temp_path, encoding='utf-8', xml_declaration=True)
+        self.tree = (None, None, None)
     
     def load_local_file(self):
         """
         Load the local RSS feed file.
         """
         if self.keep_source_rss:
-            shutil.copy(self.source_rss_file, self.default_file_path())
+            copy_file(self.source_rss_file, self.default_file_path())
         else:
             self.source_rss_file.rename(self.default_file_path())
             self.source_rss_file = None
+        self.file_path = (None, None)
 
     def get_file(self):
         """
@@ -196,11 +258,16 @@ class Rss:
         
         self.default_file_path().parent.mkdir(parents=True, exist_ok=True)
 
-        if os.path.exists(self.source_rss_file):
-            self.source_rss_file = Path(self.source_rss_file).resolve()
-            self.load_local_file()
-        else:
+        # like os.path.exists, any source that can't be resolved to a local file is treated as a URL
+        # (a URL can fail with more than FileNotFoundError, e.g. a name that is too long, and a
+        # symlink loop raises RuntimeError)
+        try:
+            source_rss_file = Path(self.source_rss_file).resolve(strict=True)
+        except (OSError, RuntimeError, ValueError):
             self.download_file()
+        else:
+            self.source_rss_file = source_rss_file
+            self.load_local_file()
 
         self.check_titles()
     
@@ -209,37 +276,18 @@ class Rss:
         Edit the RSS feed file.
         """
         # find all strings matching the regex saved in config censor_rss_patterns, and replace them
-        with self.get_file_path().open('r') as rss_file:
-            rss_content = rss_file.read()
+        rss_content = self.get_file_path().read_text()
         if not rss_content:
             log("RSS file is empty, can't be edited", "warning")
             return
-        for item in self.config.get('censor_rss_patterns', []):
-            pattern = item['pattern']
-            replacement = item['replacement']
-            flags = item.get('flags', [])
-            regex_flags = 0
-            flag_mapping = {
-                'IGNORECASE': re.IGNORECASE,
-                'MULTILINE': re.MULTILINE,
-                'DOTALL': re.DOTALL,
-                'VERBOSE': re.VERBOSE,
-                'ASCII': re.ASCII,
-            }
-            for flag in flags:
-                regex_flags |= flag_mapping.get(flag.upper(), 0)
-
-            repeat = item.get('repeat_until_no_change', False)
-
-            if repeat:
-                previous_content = None
-                while previous_content != rss_content:
-                    previous_content = rss_content
-                    rss_content = re.sub(pattern, replacement, rss_content)
-            else:
-                rss_content = re.sub(pattern, replacement, rss_content)
-        with self.get_file_path().open('w') as rss_file:
-            rss_file.write(rss_content)
+        censored_content = perform_replacements(rss_content, self.config.get('censor_rss_patterns', []))
+        # clean feeds are left alone, there is no need to rewrite the file
+        if censored_content == rss_content:
+            log("Nothing to censor in the RSS feed", "debug")
+            return
+        with atomic_write(self.get_file_path()) as temp_path:
+            temp_path.write_text(censored_content)
+        self.tree = (None, None, None)
 
     def archive_file(self):
         """
@@ -258,9 +306,11 @@ class Rss:
                     self.edit_rss_feed()
                     log(f"RSS feed edited since censor was true: {self.get_file_path()}", "debug")
             else:
-                if self.get_file_path():
-                    self.get_file_path().unlink()
-                    log(f"RSS feed deleted since censor was true: {self.get_file_path()}", "debug")
+                file_path = self.get_file_path()
+                if file_path:
+                    file_path.unlink()
+                    self.file_path = (None, None)
+                    log(f"RSS feed deleted since censor was true: {file_path}", "debug")
 
     def check_for_premium_show(self):
         """
@@ -271,17 +321,19 @@ class Rss:
         if not self.get_file_path():
             log("RSS file does not exist, can't check for premium status", "warning")
             return ""
-        tree = ET.parse(self.get_file_path())
-        root = tree.getroot()
-        channel = root.find('channel')
+        channel = self.get_channel()
         if channel is not None:
+            # networks often check the same tag (e.g. title), so each tag is only looked up once
+            tags = {}
             for network in self.config.get('premium_networks', []):
                 if not network.get('tag') or not network.get('text') or not network.get('name'):
                     log(f"Invalid premium network configuration: {network}", "debug")
                     continue
-                tag = channel.find(network['tag'])
-                if tag is not None and tag.text:
-                    if network['text'] in tag.text:
+                if network['tag'] not in tags:
+                    tags[network['tag']] = channel.findtext(network['tag'])
+                text = tags[network['tag']]
+                if text:
+                    if network['text'] in text:
                         log(f"Identified premium network {network['name']} from RSS feed", "debug")
                         self.censor_rss = True
                         if not self.config.get('include_premium_tag', True):
@@ -300,7 +352,7 @@ class Rss:
             log("RSS file does not exist, can't fix episode numbering", "warning")
             return []
         try:
-            tree = ET.parse(self.get_file_path())
+            tree = self.get_tree()
             root = tree.getroot()
 
             items = root.findall('./channel/item')
@@ -337,32 +389,37 @@ class Rss:
         log(f"Duplicating RSS feed {file_path} to {new_file_path}", "debug")
 
     def get_image_url(self):
+        """
+        Get the URL of the podcast image from the RSS feed.
+
+        :return: The image URL, or None if the feed has none.
+        """
         if not self.get_file_path():
             log("RSS file does not exist, can't get image url", "warning")
             return None
         
         try:
-            namespaces = {node[0]: node[1] for _, node in ET.iterparse(self.get_file_path(), events=['start-ns'])}
-        
-            tree = ET.parse(self.get_file_path())
-            root = tree.getroot()
-            log(f"Detected namespaces: {namespaces}", "debug")
-        
-            for prefix, uri in namespaces.items():
-                ns_path = f'./channel/{{{uri}}}image'
-                image = root.find(ns_path)
-                if image is not None:
-                    log(f"Image element found using namespace '{prefix}': {uri}", "debug")
-                    return image.attrib.get('href')
-
-            # Second attempt: Look for <image> tag without namespace
-            image = root.find('./channel/image')
+            channel = self.get_channel()
+            if channel is None:
+                log("No channel element found in RSS feed", "warning")
+                return None
+
+            # one walk over the channel finds both a namespaced image (e.g. itunes:image) and a plain one
+            image = None
+            for child in channel:
+                if not isinstance(child.tag, str):
+                    continue
+                if child.tag.startswith('{') and child.tag.endswith('}image'):
+                    log(f"Image element found using namespace {child.tag[1:-6]}", "debug")
+                    return child.attrib.get('href')
+                if child.tag == 'image' and image is None:
+                    image = child
+
             if image is not None and 'href' in image.attrib:
                 log("Image element found without namespace", "debug")
                 return image.attrib.get('href')
 
             # Fallback: Look for <image><url> structure
-            image = root.find('./channel/image')
             if image is not None:
                 url = image.find('url')
                 if url is not None and url.text:
@@ -1,4 +1,5 @@
 # utils.py
+import os
 import subprocess
 import logging
 import yaml
@@ -8,12 +9,30 @@ import fnmatch
 import requests
 from datetime import datetime
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from yaspin import yaspin
 from titlecase import titlecase
 from logging.handlers import RotatingFileHandler
 from .cache import Cache
 
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.m4a'})
+
+# regex flags that can be used in the config
+REGEX_FLAGS = {
+    'IGNORECASE': re.IGNORECASE,
+    'MULTILINE': re.MULTILINE,
+    'DOTALL': re.DOTALL,
+    'VERBOSE': re.VERBOSE,
+    'ASCII': re.ASCII,
+}
+
+# shared so downloads to the same host reuse the connection
+HTTP_SESSION = requests.Session()
+
+NON_ALPHANUMERIC_REGEX = re.compile(r'[^a-zA-Z0-9]')
+REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
 def run_command(command, progress_description=None, track_progress=False, total_episodes=None):
     """
     Run a shell command and return the output.
@@ -201,6 +220,14 @@ def log(text, level="info"):
         logging.debug(text)
     else:
         raise ValueError(f"Invalid log level: {level}")
+
+def debug_enabled():
+    """
+    Check if debug messages will be logged, so expensive debug output can be skipped.
+
+    :return: True if the debug log level is enabled, False otherwise.
+    """
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
     
 def announce(text, type=None):
     """
@@ -293,6 +320,18 @@ def special_capitalization(word, config, previous_word=None, **kwargs):
             return word
     return None
 
+@lru_cache(maxsize=4096)
+def titlecase_word(word):
+    """
+    Titlecase a single word of a filename, wrapped in a phrase so it is treated as a word in a sentence.
+
+    Episode names repeat the same words a lot, so the results are cached.
+
+    :param word: The word to titlecase.
+    :return: The titlecased word, still wrapped in the phrase.
+    """
+    return titlecase("Welcome " + word + " to the jungle")
+
 def titlecase_filename(file_path, config):
     """
     Titlecase the filename with special capitalization rules.
@@ -305,7 +344,7 @@ def titlecase_filename(file_path, config):
     previous_word = ''
     # Super hacky, but I just had to get it to work for now
     for word in file_path.stem.split():
-        new_stem += special_capitalization(word, config, previous_word) or titlecase("Welcome " + word + " to the jungle")
+        new_stem += special_capitalization(word, config, previous_word) or titlecase_word(word)
         pattern = r"welcome\s*| to the jungle"
         new_stem = re.sub(pattern, '', new_stem, flags=re.IGNORECASE)
         new_stem += ' '
@@ -354,6 +393,20 @@ def archive_metadata(file_path, target_path):
     log(f"Archived metadata file to {target_file_path}", "debug")
     return True
 
+def parse_date(date_str, date_format="%Y-%m-%d"):
+    """
+    Parse a date string, reading YYYY-MM-DD dates directly instead of going through strptime.
+
+    :param date_str: The date string to parse.
+    :param date_format: The format of the date string.
+    :return: The parsed datetime.
+    """
+    if date_format == "%Y-%m-%d" and len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            return datetime(int(year), int(month), int(day))
+    return datetime.strptime(date_str, date_format)
+
 def format_last_date(date_str, date_format_long="%B %d %Y"):
     """
     Format the last date in a long format.
@@ -362,7 +415,7 @@ def format_last_date(date_str, date_format_long="%B %d %Y"):
     :param date_format_long: The long date format.
     :return: The formatted date string
     """
-    dt = datetime.strptime(date_str, "%Y-%m-%d")
+    dt = parse_date(date_str)
     return dt.strftime(date_format_long)
 
 def find_case_insensitive_files(pattern, folder_path='.'):
@@ -373,12 +426,10 @@ def find_case_insensitive_files(pattern, folder_path='.'):
     :param folder_path: The path to the folder to search in.
     :return: A list of file paths that match the pattern.
     """
-    matches = []
-    pattern = pattern.lower()
-    for file in folder_path.iterdir():
-        if fnmatch.fnmatch(file.name.lower(), pattern):
-            matches.append(folder_path / file.name)
-    return matches
+    # translate the glob once, instead of going through fnmatch for every entry
+    regex = re.compile(fnmatch.translate(pattern.lower()))
+    with os.scandir(folder_path) as entries:
+        return [folder_path / entry.name for entry in entries if regex.match(entry.name.lower())]
 
 def get_from_cache(key, mode='r'):
     """
@@ -410,7 +461,100 @@ def normalize_string(string):
     :param string: Input string
     :return: Normalized string
     """
-    return re.sub(r'[^a-zA-Z0-9]', '', string).lower()
+    return NON_ALPHANUMERIC_REGEX.sub('', string).lower()
+
+def get_regex_flags(flags):
+    """
+    Convert a list of flag names from the config to regex flags.
+
+    :param flags: The flag names, e.g. ['IGNORECASE'].
+    :return: The combined regex flags.
+    """
+    regex_flags = 0
+    for flag in flags:
+        regex_flags |= REGEX_FLAGS.get(flag.upper(), 0)
+    return regex_flags
+
+def get_literal(item):
+    """
+    Get the text a replacement matches, if its pattern is plain text.
+
+    :param item: The replacement from the config.
+    :return: The literal text, or None if the replacement needs the regex engine.
+    """
+    pattern = item['pattern']
+    if not pattern or item.get('flags') or item.get('repeat_until_no_change') or '\\' in item['replacement']:
+        return None
+    literal = []
+    escaped = False
+    for character in pattern:
+        if escaped:
+            # escaped letters and digits are classes or backreferences, escaped punctuation is literal
+            if character.isalnum():
+                return None
+            literal.append(character)
+            escaped = False
+        elif character == '\\':
+            escaped = True
+        elif character in REGEX_SPECIAL_CHARACTERS:
+            return None
+        else:
+            literal.append(character)
+    if escaped:
+        return None
+    return ''.join(literal)
+
+def compile_replacements(replacements):
+    """
+    Compile a list of replacements from the config.
+
+    Plain text patterns skip the regex engine: longer ones use str.replace, and consecutive single
+    characters are merged into one str.translate table, as long as none of them would have changed
+    the output of an earlier one.
+
+    :param replacements: The replacements to compile.
+    :return: A list of (pattern, replacement, repeat until no change) tuples, the pattern is a compiled regex, a literal string or a translate table.
+    """
+    compiled = []
+    for item in replacements:
+        literal = get_literal(item)
+        if literal is None:
+            compiled.append((re.compile(item['pattern'], get_regex_flags(item.get('flags', []))), item['replacement'], item.get('repeat_until_no_change', False)))
+            continue
+        if len(literal) > 1:
+            compiled.append((literal, item['replacement'], False))
+            continue
+        table = compiled[-1][0] if compiled and isinstance(compiled[-1][0], dict) else None
+        if table is None or ord(literal) in table or any(literal in value for value in table.values()):
+            table = {}
+            compiled.append((table, None, False))
+        table[ord(literal)] = item['replacement']
+    return compiled
+
+def apply_replacements(string, compiled_replacements):
+    """
+    Apply a list of compiled replacements to a string.
+
+    :param string: The string to perform the replacements on.
+    :param compiled_replacements: The replacements, as returned by compile_replacements.
+    :return: The modified string.
+    """
+    for pattern, replacement, repeat in compiled_replacements:
+        if replacement is None:
+            string = string.translate(pattern)
+        elif isinstance(pattern, str):
+            string = string.replace(pattern, replacement)
+        elif repeat:
+            # a pass without matches ends the loop without comparing the strings
+            while True:
+                new_string, count = pattern.subn(replacement, string)
+                if not count or new_string == string:
+                    break
+                string = new_string
+        else:
+            string = pattern.sub(replacement, string)
+
+    return string
 
 def perform_replacements(string, file_replacements):
     """
@@ -421,32 +565,7 @@ def perform_replacements(string, file_replacements):
 
     :return: The modified string.
     """
-    for item in file_replacements:
-            pattern = item['pattern']
-            replacement = item['replacement']
-            flags = item.get('flags', [])
-            regex_flags = 0
-            flag_mapping = {
-                'IGNORECASE': re.IGNORECASE,
-                'MULTILINE': re.MULTILINE,
-                'DOTALL': re.DOTALL,
-                'VERBOSE': re.VERBOSE,
-                'ASCII': re.ASCII,
-            }
-            for flag in flags:
-                regex_flags |= flag_mapping.get(flag.upper(), 0)
-
-            repeat = item.get('repeat_until_no_change', False)
-
-            if repeat:
-                previous = None
-                while previous != string:
-                    previous = string
-                    string = re.sub(pattern, replacement, string)
-            else:
-                string = re.sub(pattern, replacement, string)
-
-    return string
+    return apply_replacements(string, compile_replacements(file_replacements))
 
 def copy_file(source, target):
     """
@@ -457,16 +576,23 @@ def copy_file(source, target):
     """
     shutil.copy(source, target)
 
-def convert_paths_to_strings(data):
-    if isinstance(data, dict):
-        return {key: convert_paths_to_strings(value) for key, value in data.items()}
-    elif isinstance(data, list):
-        return [convert_paths_to_strings(item) for item in data]
-    elif isinstance(data, Path):
-        return str(data)
-    else:
-        return data
-    
+@contextmanager
+def atomic_write(file_path):
+    """
+    Write a file through a temporary sibling that replaces it once the write is done.
+
+    The file is never left half written, and it is replaced in one go instead of truncated and grown.
+
+    :param file_path: The path to the file to write.
+    :return: The temporary path to write to.
+    """
+    temp_path = file_path.with_name(f"{file_path.name}.tmp")
+    try:
+        yield temp_path
+        os.replace(temp_path, file_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
 def download_file(url, target_path):
     """
     Download a file from a URL.
@@ -482,14 +608,21 @@ def download_file(url, target_path):
         "Connection": "keep-alive"
     }
 
+    writing = False
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        with target_path.open('wb') as file:
-            file.write(response.content)
+        # stream the body to disk in chunks instead of holding the whole file in memory
+        with HTTP_SESSION.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            with target_path.open('wb') as file:
+                writing = True
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    file.write(chunk)
     except requests.exceptions.RequestException as e:
         log(f"An error occurred while downloading {url}", "error")
         log(e, "debug")
+        if writing:
+            # don't leave a partial download behind
+            target_path.unlink(missing_ok=True)
         return False
     
     return True